@@ -374,7 +374,12 @@ class Forecast:
         self.json = json.loads(self.json_string)
         self._parse_json()
         
-    def update(self) -> str:
+    def update(self, timeout: Optional[float] = None) -> str:
+        """Update forecast data, fetching it from the API if it has expired
+
+        Args:
+            timeout: Seconds to wait for the API before giving up, None waits forever.
+        """
         
         return_status = ""
         
@@ -387,7 +392,7 @@ class Forecast:
             return_status = "Data-Not-Expired"
             return return_status
         
-        self.response = requests.get(self.url, params=self.url_parameter, headers=self.url_headers)
+        self.response = requests.get(self.url, params=self.url_parameter, headers=self.url_headers, timeout=timeout)
         
         if self.response.status_code == 304:
             return_status = "Data-Not-Modified"
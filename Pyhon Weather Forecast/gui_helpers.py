@@ -0,0 +1,110 @@
+from bisect import bisect_left
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from Weather_Forecast import Place
+
+"""
+    Logic used by weather_gui.py that does not need a window,
+    kept separate so it can be used and tested without customtkinter.
+"""
+
+
+class CityIndex:
+    """Sorted index of places for fast type-ahead lookups.
+
+    Names are sorted once at startup, so a prefix search is two binary
+    searches and a slice instead of a scan through every city.
+
+    Methods:
+        search: Return every place whose name starts with the given text.
+    """
+    def __init__(self, places: Sequence["Place"]):
+        """Create CityIndex object
+
+        Args:
+            places: The places that can be searched for.
+        """
+        ordered = sorted(places, key=lambda place: place.name.casefold())
+        self._keys: List[str] = [place.name.casefold() for place in ordered]
+        self._places: Tuple["Place", ...] = tuple(ordered)
+
+    def __len__(self) -> int:
+        return len(self._places)
+
+    def search(self, text: str) -> Tuple["Place", ...]:
+        """Return places with a name starting with text, sorted by name
+
+        The result is a read-only tuple, an empty search returns the index itself.
+        """
+        prefix = text.strip().casefold()
+        if not prefix:
+            return self._places
+
+        start = bisect_left(self._keys, prefix)
+        end = bisect_left(self._keys, prefix + "\U0010ffff", start)
+        return self._places[start:end]
+
+
+class ScrollWindow:
+    """Keeps track of which part of a long list is visible.
+
+    Attributes:
+        visible_rows: Number of rows that fit in the list.
+        item_count: Number of items in the list.
+        first: Index of the first visible item.
+
+    Methods:
+        reset: Start over with a new number of items.
+        scroll_to: Make the given item the first visible one.
+        scroll_by: Move the visible part a number of rows.
+        scroll_command: Handle a command from a scrollbar.
+        visible_indices: Indices of the visible items.
+        fractions: Start and end of the visible part, for a scrollbar.
+    """
+    def __init__(self, visible_rows: int):
+        """Create ScrollWindow object
+
+        Args:
+            visible_rows: Number of rows that fit in the list.
+        """
+        self.visible_rows = visible_rows
+        self.item_count = 0
+        self.first = 0
+
+    def reset(self, item_count: int) -> None:
+        self.item_count = item_count
+        self.first = 0
+
+    def scroll_to(self, first: int) -> bool:
+        """Move to first, kept inside the list. Return True if it moved"""
+        last_first = max(self.item_count - self.visible_rows, 0)
+        first = min(max(first, 0), last_first)
+        if first == self.first:
+            return False
+        self.first = first
+        return True
+
+    def scroll_by(self, rows: int) -> bool:
+        return self.scroll_to(self.first + rows)
+
+    def scroll_command(self, action: str, value, units: Optional[str] = None) -> bool:
+        """Handle the "moveto" and "scroll" commands sent by a scrollbar"""
+        if action == "moveto":
+            return self.scroll_to(int(float(value) * self.item_count))
+        if action == "scroll":
+            step = 1 if int(value) > 0 else -1
+            if units == "pages":
+                step *= self.visible_rows
+            return self.scroll_by(step)
+        return False
+
+    def visible_indices(self) -> range:
+        return range(self.first, min(self.first + self.visible_rows, self.item_count))
+
+    def fractions(self) -> Tuple[float, float]:
+        if self.item_count == 0:
+            return 0.0, 1.0
+        start = self.first / self.item_count
+        end = min((self.first + self.visible_rows) / self.item_count, 1.0)
+        return start, end
@@ -0,0 +1,119 @@
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from gui_helpers import CityIndex, ScrollWindow
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def place(name):
+    # CityIndex only needs the name, so Weather_Forecast is not imported
+    return SimpleNamespace(name=name)
+
+
+def names(places):
+    return [place.name for place in places]
+
+
+@pytest.fixture
+def index():
+    names = ["Oslo", "Bergen", "Ålesund", "Øystese", "osøyro", "Årdal", "Ørsta"]
+    return CityIndex([place(name) for name in names])
+
+
+def test_empty_search_returns_all_places_sorted(index):
+    assert names(index.search("")) == sorted(names(index.search("")), key=str.casefold)
+    assert len(index.search("")) == len(index)
+
+
+def test_whitespace_search_returns_all_places(index):
+    assert index.search("   ") == index.search("")
+
+
+def test_search_is_case_insensitive(index):
+    assert names(index.search("OS")) == ["Oslo", "osøyro"]
+    assert names(index.search("  os ")) == ["Oslo", "osøyro"]
+
+
+def test_search_non_ascii_prefix(index):
+    assert names(index.search("å")) == ["Ålesund", "Årdal"]
+    assert names(index.search("Ø")) == ["Ørsta", "Øystese"]
+
+
+def test_search_without_match(index):
+    assert index.search("xyz") == ()
+    assert index.search("Oslox") == ()
+
+
+def test_search_result_is_read_only(index):
+    assert isinstance(index.search(""), tuple)
+
+
+def test_search_norwegian_cities():
+    with open(DATA_DIR / "nor.json") as city_file:
+        city_data = json.load(city_file)
+    index = CityIndex([place(city["city"]) for city in city_data])
+
+    assert names(index.search("tr")) == ["Tromsdalen", "Tromsø", "Trondheim"]
+
+
+def test_search_is_within_frame_budget():
+    index = CityIndex([place(f"City {number}") for number in range(50000)])
+
+    start = time.perf_counter()
+    for prefix in ["c", "city 1", "city 4999", "x"]:
+        index.search(prefix)
+    # One frame at 60 frames per second
+    assert time.perf_counter() - start < 0.016
+
+
+def test_scroll_clamps_when_fewer_items_than_rows():
+    window = ScrollWindow(visible_rows=5)
+    window.reset(3)
+
+    assert not window.scroll_to(2)
+    assert not window.scroll_by(-1)
+    assert window.first == 0
+    assert window.visible_indices() == range(0, 3)
+    assert window.fractions() == (0.0, 1.0)
+
+
+def test_scroll_clamps_to_last_page():
+    window = ScrollWindow(visible_rows=5)
+    window.reset(20)
+
+    assert window.scroll_to(100)
+    assert window.first == 15
+    assert window.visible_indices() == range(15, 20)
+    assert window.fractions() == (0.75, 1.0)
+
+    assert window.scroll_to(-3)
+    assert window.first == 0
+
+
+def test_scroll_command_moveto_and_pages():
+    window = ScrollWindow(visible_rows=10)
+    window.reset(100)
+
+    assert window.scroll_command("moveto", "0.5")
+    assert window.first == 50
+    assert window.scroll_command("scroll", "1", "pages")
+    assert window.first == 60
+    assert window.scroll_command("scroll", "-3", "units")
+    assert window.first == 59
+    assert not window.scroll_command("unknown", "1")
+
+
+def test_reset_scrolls_to_top():
+    window = ScrollWindow(visible_rows=4)
+    window.reset(10)
+    window.scroll_to(6)
+
+    window.reset(0)
+    assert window.first == 0
+    assert window.visible_indices() == range(0, 0)
+    assert window.fractions() == (0.0, 1.0)
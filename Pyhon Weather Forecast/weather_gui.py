@@ -1,93 +1,318 @@
 import customtkinter
 from Weather_Forecast import Place, Forecast
+from gui_helpers import CityIndex, ScrollWindow
+from typing import Callable, List, Optional, Sequence
 import datetime as dt
 import json
+import logging
+import queue
+import threading
 
 USER_AGENT = "Weather_ForeCast jorgen@funkweb.org"
+CITY_FILE = "./data/nor.json"
+START_CITY = "Oslo"
 
-nor_cities = open("./data/nor.json")
-# Convert JSON object to dict
-nor_data = json.load(nor_cities)
-# Close JSON file
-nor_cities.close()
-norwegian_citys = []
-for city in nor_data:
-    norwegian_citys.append(Place(city["city"], float(city["lat"]), float(city["lon"])))
-    
-oslo_city = None
-city_names = []
-for town in norwegian_citys:
-    city_names.append(town.name)
-    if town.name == "Oslo":
-        oslo_city = town
-
-#print(oslo_city)
-forecast = Forecast(oslo_city, USER_AGENT)
-forecast.update()
-
-def get_forecast(choice):
-            for city in norwegian_citys:
-                if city.name == choice:
-                    new_forecast = Forecast(city, USER_AGENT)
-                    new_forecast.update()
-                    forecast = new_forecast
-
-class ScrollFrame(customtkinter.CTkScrollableFrame):
-    def __init__(self, master, **kwargs):
+# Delay before a search runs, so fast typing only triggers one lookup
+SEARCH_DELAY_MS = 150
+# How often the UI thread checks for finished forecast downloads
+POLL_INTERVAL_MS = 50
+# Seconds to wait for api.met.no before giving up on a forecast
+FETCH_TIMEOUT = 10
+
+logger = logging.getLogger(__name__)
+
+
+def load_places(file_name: str) -> List[Place]:
+    """Read places from a JSON file made by excel_to_json.py"""
+    with open(file_name) as city_file:
+        city_data = json.load(city_file)
+
+    places = []
+    for city in city_data:
+        places.append(Place(city["city"], float(city["lat"]), float(city["lon"])))
+    return places
+
+
+class VirtualList(customtkinter.CTkFrame):
+    """Scrollable list that only creates widgets for the visible rows.
+
+    A fixed number of labels is created once and reused while scrolling,
+    only their text changes. This keeps the window responsive no matter
+    how many items the list holds.
+
+    Methods:
+        set_items: Replace the items shown in the list.
+    """
+    def __init__(
+        self,
+        master,
+        visible_rows: int = 10,
+        formatter: Callable[[object], str] = str,
+        command: Optional[Callable[[object], None]] = None,
+        **kwargs,
+    ):
+        """Create VirtualList object
+
+        Args:
+            master: Parent widget.
+            visible_rows: Number of row widgets to create.
+            formatter: Turns an item into the text shown for its row.
+            command: Called with the item when a row is clicked.
+        """
         super().__init__(master, **kwargs)
-        
-        self.forecast = forecast
-        
-        self._label = customtkinter.CTkLabel(self, text=self.forecast.place.name, font=('Arial bold', 25))
+
+        self._formatter = formatter
+        self._command = command
+        self._items: Sequence[object] = []
+        self._window = ScrollWindow(visible_rows)
+
+        self.grid_columnconfigure(0, weight=1)
+
+        self._rows: List[customtkinter.CTkLabel] = []
+        for row_number in range(visible_rows):
+            row = customtkinter.CTkLabel(self, text="", anchor="w")
+            row.grid(row=row_number, column=0, padx=10, sticky="ew")
+            row.bind("<Button-1>", lambda event, n=row_number: self._on_click(n))
+            self._bind_wheel(row)
+            self._rows.append(row)
+
+        self._scrollbar = customtkinter.CTkScrollbar(self, command=self._on_scrollbar)
+        self._scrollbar.grid(row=0, column=1, rowspan=visible_rows, sticky="ns")
+        self._bind_wheel(self)
+
+        self._render()
+
+    def set_items(self, items: Sequence[object]) -> None:
+        """Show items in the list and scroll back to the top"""
+        self._items = items
+        self._window.reset(len(items))
+        self._render()
+
+    def refresh(self) -> None:
+        """Redraw the visible rows without changing the scroll position"""
+        self._render()
+
+    def _bind_wheel(self, widget) -> None:
+        widget.bind("<MouseWheel>", lambda event: self._scroll_by(-1 if event.delta > 0 else 1))
+        # Linux reports the mouse wheel as button 4 and 5
+        widget.bind("<Button-4>", lambda event: self._scroll_by(-1))
+        widget.bind("<Button-5>", lambda event: self._scroll_by(1))
+
+    def _on_scrollbar(self, action: str, value, units: Optional[str] = None) -> None:
+        if self._window.scroll_command(action, value, units):
+            self._render()
+
+    def _scroll_by(self, rows: int) -> None:
+        if self._window.scroll_by(rows):
+            self._render()
+
+    def _render(self) -> None:
+        visible = self._window.visible_indices()
+        for offset, row in enumerate(self._rows):
+            if offset < len(visible):
+                row.configure(text=self._formatter(self._items[visible[offset]]))
+            else:
+                row.configure(text="")
+        self._scrollbar.set(*self._window.fractions())
+
+    def _on_click(self, row_number: int) -> None:
+        index = self._window.first + row_number
+        if self._command is not None and index < len(self._items):
+            self._command(self._items[index])
+
+
+class CitySearchFrame(customtkinter.CTkFrame):
+    """Type-ahead search for choosing a city.
+
+    The search runs when the user has stopped typing for SEARCH_DELAY_MS,
+    and the matches are shown in a VirtualList.
+    """
+    def __init__(self, master, index: CityIndex, command: Callable[[Place], None]):
+        super().__init__(master)
+
+        self._index = index
+        self._command = command
+        self._search_job: Optional[str] = None
+
+        self.entry = customtkinter.CTkEntry(self, placeholder_text="Søk etter by")
+        self.entry.grid(row=0, column=0, padx=10, pady=10, sticky="ew")
+        self.entry.bind("<KeyRelease>", self._schedule_search)
+        self.entry.bind("<Return>", self._choose_first)
+
+        self.results = VirtualList(
+            self,
+            visible_rows=8,
+            formatter=lambda place: place.name,
+            command=command,
+        )
+        self.results.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="ew")
+        self.results.set_items(self._index.search(""))
+
+    def _schedule_search(self, event=None) -> None:
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DELAY_MS, self._run_search)
+
+    def _run_search(self) -> None:
+        self._search_job = None
+        self.results.set_items(self._index.search(self.entry.get()))
+
+    def _choose_first(self, event=None) -> None:
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+            self._search_job = None
+        matches = self._index.search(self.entry.get())
+        self.results.set_items(matches)
+        if matches:
+            self._command(matches[0])
+
+
+class ForecastFrame(customtkinter.CTkFrame):
+    """Shows the forecast for a place, one row per interval"""
+    def __init__(self, master, show_variables: Callable[[], List[str]], **kwargs):
+        super().__init__(master, **kwargs)
+
+        self.forecast: Optional[Forecast] = None
+        self._show_variables = show_variables
+
+        self._label = customtkinter.CTkLabel(self, text="", font=('Arial bold', 25))
         self._label.grid(row=0, column=0, padx=20)
-        
-        #self.hour_label = customtkinter.CTkLabel(self, text=)
-        
+
+        self.intervals = VirtualList(self, visible_rows=12, formatter=self._format_interval, width=300)
+        self.intervals.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
+
+    def show_loading(self, place: Place) -> None:
+        self._label.configure(text=f"Laster {place.name}...")
+
+    def show_error(self, place: Place, error: Exception) -> None:
+        self._label.configure(text=f"Kunne ikke laste {place.name} ({type(error).__name__})")
+        logger.warning("Failed to load forecast for %s", place, exc_info=error)
+
+    def show_forecast(self, forecast: Forecast) -> None:
+        self.forecast = forecast
+        self._label.configure(text=forecast.place.name)
+        self.intervals.set_items(forecast.data.intervals)
+
+    def refresh(self) -> None:
+        """Redraw the visible rows, e.g. after the chosen variables changed"""
+        self.intervals.refresh()
+
+    def _format_interval(self, interval) -> str:
+        text = interval.start_time.strftime("%d.%m kl. %H:%M:")
+        for name in self._show_variables():
+            if name in interval.variables:
+                variable = interval.variables[name]
+                text += f" {variable.value}{variable.units}"
+        return text
+
+
 class CheckBoxFrame(customtkinter.CTkFrame):
-    def __init__(self, master):
+    def __init__(self, master, command: Optional[Callable[[], None]] = None):
         super().__init__(master)
-        
-        self.temperatur = customtkinter.CTkCheckBox(self, text="Temperatur")
+
+        self.temperatur = customtkinter.CTkCheckBox(self, text="Temperatur", command=command)
         self.temperatur.grid(row=0, column=0, padx=10, pady=10, sticky="w")
-        self.regn = customtkinter.CTkCheckBox(self, text="Regn")
+        self.temperatur.select()
+        self.regn = customtkinter.CTkCheckBox(self, text="Regn", command=command)
         self.regn.grid(row=1, column=0, padx=10, pady=10, sticky="w")
-        self.vind = customtkinter.CTkCheckBox(self, text="Vind")
+        self.vind = customtkinter.CTkCheckBox(self, text="Vind", command=command)
         self.vind.grid(row=3, column=0, padx=10, pady=10, sticky="w")
-        
-        
+
+    def chosen_variables(self) -> List[str]:
+        """Names of the forecast variables that are checked"""
+        variables = []
+        if self.temperatur.get():
+            variables.append("air_temperature")
+        if self.regn.get():
+            variables.append("precipitation_amount")
+        if self.vind.get():
+            variables.append("wind_speed")
+        return variables
+
 
 class App(customtkinter.CTk):
-    def __init__(self):
+    def __init__(self, index: CityIndex, start_city: Optional[Place] = None):
         super().__init__()
         self.title("Weather Forecast v0.0.1")
         self._set_appearance_mode("System")
         #self.set_default_color_theme("blue")
         #self.geometry("480x380")
         self.resizable(True, True)
-        
-        """
-        self.forecast = Forecast(oslo_city, USER_AGENT)
-        
-        def get_forecast(choice):
-            for city in norwegian_citys:
-                if city.name == choice:
-                    self.forecast = Forecast(city, USER_AGENT)
-                    self.forecast.update()
-            print(choice)
-        """
-        self.city_chooser = customtkinter.CTkComboBox(self, values=city_names, command=get_forecast)
-        self.city_chooser.grid(row=0, column=1, padx=20, pady=20)
-        
-        self.scroll_frame = ScrollFrame(master=self, width=300, height=200)
-        self.scroll_frame.grid(row=1, column=0, padx=20, pady=20)
-        
-        self.checkbox_frame = CheckBoxFrame(self)
+
+        # Forecasts are downloaded on a single worker thread and handed back
+        # here, tkinter widgets may only be touched from the UI thread.
+        self._requests: queue.Queue = queue.Queue()
+        self._results: queue.Queue = queue.Queue()
+        self._request_id = 0
+        self._worker = threading.Thread(target=self._fetch_forecasts, daemon=True)
+        self._worker.start()
+
+        self.city_chooser = CitySearchFrame(self, index, command=self.load_forecast)
+        self.city_chooser.grid(row=0, column=1, padx=20, pady=20, sticky="n")
+
+        self.checkbox_frame = CheckBoxFrame(self, command=self._refresh_forecast)
         self.checkbox_frame.grid(row=1, column=1, padx=10, pady=10, sticky="ew")
-        
+
+        self.forecast_frame = ForecastFrame(master=self, show_variables=self.checkbox_frame.chosen_variables)
+        self.forecast_frame.grid(row=0, column=0, rowspan=2, padx=20, pady=20)
+
         #self.button = customtkinter.CTkButton(self, text="Test", command=self.button_callback)
         #self.button.pack(padx=20, pady=20)
-        
-        
-app = App()
-app.mainloop()
-        
\ No newline at end of file
+
+        if start_city is not None:
+            self.load_forecast(start_city)
+        self.after(POLL_INTERVAL_MS, self._poll_results)
+
+    def load_forecast(self, place: Place) -> None:
+        """Fetch the forecast for place without blocking the window"""
+        self._request_id += 1
+        self.forecast_frame.show_loading(place)
+        self._requests.put((self._request_id, place))
+
+    def _fetch_forecasts(self) -> None:
+        while True:
+            request_id, place = self._requests.get()
+            # Skip cities the user has already clicked past
+            try:
+                while True:
+                    request_id, place = self._requests.get_nowait()
+            except queue.Empty:
+                pass
+
+            try:
+                forecast = Forecast(place, USER_AGENT)
+                forecast.update(timeout=FETCH_TIMEOUT)
+                self._results.put((request_id, place, forecast, None))
+            except Exception as error:
+                self._results.put((request_id, place, None, error))
+
+    def _poll_results(self) -> None:
+        try:
+            while True:
+                request_id, place, forecast, error = self._results.get_nowait()
+                # Only show the city that was chosen last
+                if request_id != self._request_id:
+                    continue
+                if error is not None:
+                    self.forecast_frame.show_error(place, error)
+                else:
+                    self.forecast_frame.show_forecast(forecast)
+        except queue.Empty:
+            pass
+        finally:
+            self.after(POLL_INTERVAL_MS, self._poll_results)
+
+    def _refresh_forecast(self) -> None:
+        self.forecast_frame.refresh()
+
+
+if __name__ == "__main__":
+    places = load_places(CITY_FILE)
+    start_city = None
+    for place in places:
+        if place.name == START_CITY:
+            start_city = place
+            break
+
+    app = App(CityIndex(places), start_city)
+    app.mainloop()